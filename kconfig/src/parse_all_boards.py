@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 vivo Mobile Communication Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Batch version of parse_const.py and parse_rustflags.py
+Parse Kconfig once per board and load each build_type defconfig into it
+Generate <output_dir>/<board>/<build_type>/{kconfig.rs,rustflags}
+"""
+
+import sys
+import errno
+import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from parse_const import collect_int_configs, generate_rust_const
+from parse_rustflags import collect_rustflags
+
+
+def list_boards(kconfig_dir):
+    return sorted(
+        name for name in os.listdir(kconfig_dir)
+        if os.path.isfile(os.path.join(kconfig_dir, name, 'Kconfig')))
+
+
+def list_build_types(kconfig_dir, board):
+    board_dir = os.path.join(kconfig_dir, board)
+    return sorted(
+        name for name in os.listdir(board_dir)
+        if os.path.isfile(os.path.join(board_dir, name, 'defconfig')))
+
+
+def parse_board(kconfig_path, kconfig_dir, board, build_types, output_dir):
+    from kconfiglib import Kconfig
+
+    # The top level Kconfig sources "$KCONFIG_DIR/$BOARD/Kconfig", so the
+    # parsed tree can only be shared between build_types of one board.
+    os.environ['BOARD'] = board
+    os.environ['KCONFIG_DIR'] = kconfig_dir
+    kconf = Kconfig(kconfig_path)
+
+    for build_type in build_types:
+        dotconfig = os.path.join(kconfig_dir, board, build_type, 'defconfig')
+        try:
+            kconf.load_config(dotconfig)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            kconf.unset_values()
+
+        out_dir = os.path.join(output_dir, board, build_type)
+        configs = collect_int_configs(kconf)
+        if configs:
+            generate_rust_const(configs, os.path.join(out_dir, 'kconfig.rs'))
+
+        rustflags = collect_rustflags(kconf)
+        os.makedirs(out_dir, exist_ok=True)
+        with open(os.path.join(out_dir, 'rustflags'), 'w') as f:
+            if rustflags:
+                f.write("\n".join(rustflags) + "\n")
+    return board
+
+
+def _parse_board(*args):
+    # kconfiglib's _KconfigIOError cannot be unpickled by the process pool,
+    # hand it back to the parent as a plain OSError
+    try:
+        return parse_board(*args)
+    except OSError as e:
+        raise OSError(e.errno, str(e)) from None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--kconfig", help="Kconfig dir")
+    parser.add_argument("--boards",
+                        help="comma separated target boards, default all")
+    parser.add_argument("--build_types",
+                        help="comma separated build_types, default all")
+    parser.add_argument("--output_dir", help="output directory")
+    parser.add_argument("--jobs", type=int, help="parallel board parsers")
+    args = parser.parse_args()
+    kconfig_dir = os.path.dirname(args.kconfig)
+    try:
+        if args.boards:
+            boards = args.boards.split(',')
+        else:
+            boards = list_boards(kconfig_dir)
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            futures = []
+            for board in boards:
+                if args.build_types:
+                    build_types = args.build_types.split(',')
+                else:
+                    build_types = list_build_types(kconfig_dir, board)
+                futures.append(
+                    executor.submit(_parse_board, args.kconfig, kconfig_dir,
+                                    board, build_types, args.output_dir))
+            for future in futures:
+                future.result()
+    except Exception as e:
+        print(f"\n[ERROR] Parse failed: {e}", file=sys.stderr)
+        sys.exit(1)
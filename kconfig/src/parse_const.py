@@ -20,42 +20,58 @@ Generate const value to rust
 """
 
 import sys
-from kconfiglib import Kconfig, INT
+import errno
 import os
 import argparse
 
 
-def parse_int_configs(kconfig_path, board, build_type):
+def parse_int_configs(kconfig_path, kconfig_dir, board, build_type):
+    # Imported here so --help and argument errors do not pay for kconfiglib
+    from kconfiglib import Kconfig
+
     kconf = Kconfig(kconfig_path)
-    dotconfig = os.path.join(os.path.dirname(kconfig_path), board, build_type,
-                             'defconfig')
-    if os.path.exists(dotconfig):
+    dotconfig = os.path.join(kconfig_dir, board, build_type, 'defconfig')
+    try:
         kconf.load_config(dotconfig)
+    except OSError as e:
+        # no defconfig for this build_type, use the Kconfig defaults
+        if e.errno != errno.ENOENT:
+            raise
+
+    return collect_int_configs(kconf)
+
+
+def collect_int_configs(kconf):
+    """Collect the int configs of an already loaded Kconfig"""
+    from kconfiglib import INT, expr_value
 
     configs = {}
+    set_config = configs.__setitem__
+    # Symbols in the same menu/if block share one direct_dep expression
+    dep_ok = {}
 
-    for sym in kconf.defined_syms:
+    for sym in kconf.unique_defined_syms:
+        # choice members are always bool/tristate
+        if sym.choice is not None:
+            continue
         if sym.orig_type != INT or not sym.visibility:
             continue
 
         # check depends on
-        if sym.direct_dep is not None and sym.direct_dep.tri_value == 0:
-            continue
+        dep = sym.direct_dep
+        if dep is not None:
+            ok = dep_ok.get(id(dep))
+            if ok is None:
+                ok = dep_ok[id(dep)] = expr_value(dep) != 0
+            if not ok:
+                continue
 
-        value = None
         try:
-            # 1. The value set in .config is used first
-            if sym.str_value:
-                value = int(sym.str_value)
-            # 2. Try to get a default value (check the default ... if ... condition)
-            elif sym.defaults:
-                for default, cond in sym.defaults:
-                    if cond is None or cond.eval():
-                        value = int(default.str_value)
-                        break
-
-            if value is not None:
-                configs[sym.name.upper()] = value
+            # str_value uses the value set in .config first, then the active
+            # default, and enforces the active range on both
+            str_value = sym.str_value
+            if str_value:
+                set_config(sym.name.upper(), int(str_value))
 
         except (ValueError, TypeError) as e:
             print(f"[WARN] items {sym.name} value conversion failed: {e}",
@@ -64,18 +80,24 @@ def parse_int_configs(kconfig_path, board, build_type):
     return configs
 
 
-def generate_rust_const(configs, output):
-    rust_code = """
+RUST_HEADER = b"""
 // Automatically generated configuration constants
 #![no_std]
 #![allow(unused)]
 """
+
+
+def generate_rust_const(configs, output):
+    rust_code = bytearray(RUST_HEADER)
     for name, value in sorted(configs.items()):
-        rust_code += f"pub const {name}: usize = {value};\n"
+        rust_code += b"pub const %s: usize = %d;\n" % (name.encode(), value)
     output_dir = os.path.dirname(output)
     os.makedirs(output_dir, exist_ok=True)
-    with open(output, "w") as f:
-        f.write(rust_code)
+    fd = os.open(output, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, rust_code)
+    finally:
+        os.close(fd)
 
 
 if __name__ == "__main__":
@@ -86,9 +108,11 @@ if __name__ == "__main__":
     parser.add_argument("--output", help="Rust file output directory")
     args = parser.parse_args()
     os.environ['BOARD'] = args.board
-    os.environ['KCONFIG_DIR'] = os.path.dirname(args.kconfig)
+    kconfig_dir = os.path.dirname(args.kconfig)
+    os.environ['KCONFIG_DIR'] = kconfig_dir
     try:
-        results = parse_int_configs(args.kconfig, args.board, args.build_type)
+        results = parse_int_configs(args.kconfig, kconfig_dir,
+                                    args.board, args.build_type)
         if results:
             generate_rust_const(results, args.output)
     except Exception as e:
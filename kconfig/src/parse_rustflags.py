@@ -20,24 +20,51 @@ Generate config for rust build
 """
 
 import sys
-from kconfiglib import Kconfig, BOOL, STRING
+import errno
 import os
 import argparse
 
 
-def parse_rustflags(kconfig_path, board, build_type):
-    rustflags = []
+def _handle_bool(sym, enabled):
+    if sym.tri_value == 2:
+        enabled.append((sym.name, None))
+
+
+def _handle_string(sym, enabled):
+    str_value = sym.str_value
+    if str_value:
+        enabled.append((sym.name, str_value))
+
+
+def parse_rustflags(kconfig_path, kconfig_dir, board, build_type):
+    # Imported here so --help and argument errors do not pay for kconfiglib
+    from kconfiglib import Kconfig
+
     kconf = Kconfig(kconfig_path)
-    dotconfig = os.path.join(os.path.dirname(kconfig_path), board, build_type,
-                             'defconfig')
-    if os.path.exists(dotconfig):
+    dotconfig = os.path.join(kconfig_dir, board, build_type, 'defconfig')
+    try:
         kconf.load_config(dotconfig)
-    for sym in kconf.defined_syms:
-        if sym.type == BOOL and sym.tri_value == 2:
-            rustflags.append(sym.name.lower())
-        elif sym.type == STRING and sym.str_value:
-            rustflags.append(f'{sym.name.lower()}="{sym.str_value.lower()}"')
-    return rustflags
+    except OSError as e:
+        # no defconfig for this build_type, use the Kconfig defaults
+        if e.errno != errno.ENOENT:
+            raise
+    return collect_rustflags(kconf)
+
+
+def collect_rustflags(kconf):
+    """Collect the rustflags of an already loaded Kconfig"""
+    from kconfiglib import BOOL, STRING
+
+    enabled = []
+    get_handler = {BOOL: _handle_bool, STRING: _handle_string}.get
+    for sym in kconf.unique_defined_syms:
+        handler = get_handler(sym.type)
+        if handler is not None:
+            handler(sym, enabled)
+    return [
+        name.lower() if value is None else f'{name.lower()}="{value.lower()}"'
+        for name, value in enabled
+    ]
 
 
 if __name__ == '__main__':
@@ -47,12 +74,13 @@ if __name__ == '__main__':
     parser.add_argument("--build_type", help="target build_type")
     args = parser.parse_args()
     os.environ['BOARD'] = args.board
-    os.environ['KCONFIG_DIR'] = os.path.dirname(args.kconfig)
+    kconfig_dir = os.path.dirname(args.kconfig)
+    os.environ['KCONFIG_DIR'] = kconfig_dir
     try:
-        rustflags = parse_rustflags(args.kconfig, args.board, args.build_type)
+        rustflags = parse_rustflags(args.kconfig, kconfig_dir,
+                                    args.board, args.build_type)
         if rustflags:
-            for flag in rustflags:
-                print(flag)
+            sys.stdout.write("\n".join(rustflags) + "\n")
     except Exception as e:
         print(f"\n[ERROR] Parse failed: {e}", file=sys.stderr)
         sys.exit(1)
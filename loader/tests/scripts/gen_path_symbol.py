@@ -14,14 +14,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import os
 import sys
-import re
-import subprocess
-import shlex
-import shutil
-import tempfile
-import logging
 
 
 def is_elf_file(filepath):
@@ -34,18 +29,26 @@ def is_elf_file(filepath):
         True if the file is an ELF file, False otherwise.
     """
     try:
-        with open(filepath, 'rb') as f:
-            magic = f.read(4)
-            return magic == b'\x7fELF'
-    except FileNotFoundError:
+        fd = os.open(filepath, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0))
+    except OSError:
         return False
-    except Exception:
+    try:
+        return os.read(fd, 4) == b'\x7fELF'
+    except OSError:
         return False
+    finally:
+        os.close(fd)
 
 
 def gen_file(out, sym, path):
-    with open(out, 'w') as f:
-        f.write(f'const char *{sym}="{path}";')
+    # json.dumps escapes quotes and backslashes like a C string literal.
+    literal = json.dumps(path, ensure_ascii=False)
+    data = f'const char *{sym}={literal};'.encode()
+    fd = os.open(out, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
     return 0
 
 